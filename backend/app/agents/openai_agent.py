@@ -1,33 +1,140 @@
 """OpenAI-based search agent implementation with WebSearchTool"""
 
 import os
-import json
-from typing import List, Dict, Any, Optional, Literal
-from dataclasses import dataclass
-from agents import Agent, Runner
+import asyncio
+import random
+import orjson
+from typing import List, Dict, Any, Optional, Literal, Callable, Awaitable, AsyncIterator, Tuple, TypeVar
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from async_lru import alru_cache
+from agents import Agent, Runner, RunConfig, OpenAIProvider, set_default_openai_client
 from agents.tool import WebSearchTool, UserLocation, Filters
-import openai
-from openai import OpenAI
+from openai import AsyncOpenAI, APIError, RateLimitError, APIConnectionError, APITimeoutError
+from openai.types.responses import ResponseTextDeltaEvent
+from ..http import create_http_client
 
+T = TypeVar("T")
 
-@dataclass
+# Transient OpenAI errors that are worth retrying with backoff
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError)
+MAX_RETRY_ATTEMPTS = 3
+
+# Number of search queries issued per research depth
+DEPTH_QUERY_COUNTS = MappingProxyType({"basic": 3, "detailed": 5, "comprehensive": 7})
+
+# WebSearchTool context size used per research depth
+DEPTH_CONTEXT_SIZES = MappingProxyType({"basic": "low", "detailed": "medium", "comprehensive": "high"})
+
+# Query templates used instead of the LLM query generator for basic research
+BASIC_QUERY_TEMPLATES = (
+    "{topic} overview and definition",
+    "{topic} recent developments",
+    "{topic} key applications and implications",
+)
+
+# Longest per-query answer embedded in synthesis and report prompts
+MAX_RESULT_CHARS = 4000
+
+# Endpoint used for each request in a research batch job
+BATCH_ENDPOINT = "/v1/responses"
+
+ContextSize = Literal["low", "medium", "high"]
+ResearchDepth = Literal["basic", "detailed", "comprehensive"]
+CONTEXT_SIZES = ("low", "medium", "high")
+
+SEARCH_AGENT_INSTRUCTIONS = """You are an advanced search assistant powered by web search capabilities.
+            You can help users find accurate, up-to-date information from the web.
+            
+            When searching:
+            - Be thorough and provide comprehensive answers
+            - Always cite your sources with URLs when available
+            - Provide context and explanations for your findings
+            - If information is uncertain or conflicting, mention multiple perspectives
+            - Focus on recent and authoritative sources when possible
+            
+            Your goal is to provide helpful, accurate, and well-sourced information."""
+
+
+def _format_results(results: List[Dict[str, str]], text_key: str) -> str:
+    """Render per-query results as compact prompt context, truncating very long answers."""
+    return "\n\n".join(
+        f"## Q: {result['query']}\n{result[text_key][:MAX_RESULT_CHARS]}"
+        for result in results
+    )
+
+
+def _report_prompt(topic: str, search_results: List[Dict[str, str]]) -> str:
+    """Build the prompt that turns research findings into a report."""
+    return f"""Based on the following research findings about "{topic}",
+            create a comprehensive research report:
+            
+            {_format_results(search_results, "findings")}
+            
+            Structure your report with:
+            1. Executive Summary
+            2. Detailed Findings (organized by theme)
+            3. Key Insights and Implications
+            4. Sources and References
+            5. Conclusion
+            
+            Make it thorough, well-organized, and properly cited."""
+
+
+def _response_output_text(body: Dict[str, Any]) -> str:
+    """Join the output text of a raw Responses API response body."""
+    return "".join(
+        content.get("text", "")
+        for item in body.get("output", [])
+        if item.get("type") == "message"
+        for content in item.get("content", [])
+        if content.get("type") == "output_text"
+    )
+
+
+class _NormalizedQuery:
+    """A search query that hashes and compares by its normalized text.
+    
+    Used as the search cache key so trivially different queries share an
+    entry, while the agent is still sent the original query text.
+    """
+    __slots__ = ("text", "_key")
+    
+    def __init__(self, text: str):
+        self.text = text
+        self._key = text.strip().lower()
+    
+    def __hash__(self) -> int:
+        return hash(self._key)
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _NormalizedQuery) and self._key == other._key
+
+
+@dataclass(slots=True, frozen=True)
 class SearchConfig:
     """Configuration for web search"""
     user_location: Optional[UserLocation] = None
     filters: Optional[Filters] = None
-    search_context_size: Literal["low", "medium", "high"] = "medium"
+    search_context_size: ContextSize = "medium"
 
 
 class OpenAISearchAgent:
     """A search agent using OpenAI's models with WebSearchTool"""
     
-    def __init__(self, api_key: Optional[str] = None, search_config: Optional[SearchConfig] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        search_config: Optional[SearchConfig] = None,
+        max_concurrency: int = 10
+    ):
         """
         Initialize the OpenAI search agent with WebSearchTool.
         
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             search_config: Configuration for the web search tool
+            max_concurrency: Maximum number of searches run concurrently
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -36,42 +143,87 @@ class OpenAISearchAgent:
         # Set the API key for the agents SDK
         os.environ["OPENAI_API_KEY"] = self.api_key
         
-        # Initialize OpenAI client for direct API access
-        self.client = OpenAI(api_key=self.api_key)
+        # Initialize async OpenAI client for direct API access on a pooled connection.
+        # The agent owns the pool, so each app lifespan gets a fresh one that aclose() shuts.
+        self.client = AsyncOpenAI(api_key=self.api_key, http_client=create_http_client())
+        
+        # Have the agents SDK Runner use the same client and transport. Agent runs
+        # are retried by _with_retry, so turn off the client's own retries there
+        # rather than multiplying attempts under rate limiting.
+        set_default_openai_client(self.client.with_options(max_retries=0))
+        
+        # Streamed runs cannot be retried once tokens are sent, so they keep the
+        # client's own retries, which only cover the requests before streaming
+        self._stream_run_config = RunConfig(model_provider=OpenAIProvider(openai_client=self.client))
         
         # Initialize search configuration
         self.search_config = search_config or SearchConfig()
         
-        # Create WebSearchTool with configuration
-        self.web_search_tool = WebSearchTool(
-            user_location=self.search_config.user_location,
-            filters=self.search_config.filters,
-            search_context_size=self.search_config.search_context_size
-        )
+        # Limit concurrent searches fanned out by multi-query and research
+        self._sem = asyncio.Semaphore(max_concurrency)
         
-        # Create the agent with WebSearchTool using GPT-5 mini
-        self.agent = Agent(
-            name="WebSearchAssistant",
-            instructions="""You are an advanced search assistant powered by web search capabilities.
-            You can help users find accurate, up-to-date information from the web.
-            
-            When searching:
-            - Be thorough and provide comprehensive answers
-            - Always cite your sources with URLs when available
-            - Provide context and explanations for your findings
-            - If information is uncertain or conflicting, mention multiple perspectives
-            - Focus on recent and authoritative sources when possible
-            
-            Your goal is to provide helpful, accurate, and well-sourced information.""",
-            tools=[self.web_search_tool],
-            model="gpt-5-mini"  # Use GPT-5 mini - smallest GPT-5 model
+        # Create one WebSearchTool per context size so concurrent searches
+        # never have to mutate shared tool state
+        self._tools = {
+            size: WebSearchTool(
+                user_location=self.search_config.user_location,
+                filters=self.search_config.filters,
+                search_context_size=size
+            )
+            for size in CONTEXT_SIZES
+        }
+        
+        # Create a matching agent with WebSearchTool using GPT-5 mini
+        self._agents_by_ctx = {
+            size: Agent(
+                name="WebSearchAssistant",
+                instructions=SEARCH_AGENT_INSTRUCTIONS,
+                tools=[self._tools[size]],
+                model="gpt-5-mini"  # Use GPT-5 mini - smallest GPT-5 model
+            )
+            for size in CONTEXT_SIZES
+        }
+        
+        # Tool-less agents are built once and reused across requests
+        self._chat_only_agent = Agent(
+            name="ChatAssistant",
+            instructions="""You are a helpful assistant. Provide clear, accurate,
+            and helpful responses based on your knowledge.""",
+            model="gpt-5-mini"
+        )
+        self._query_gen_agent = Agent(
+            name="QueryGenerator",
+            instructions="Generate focused search queries for research.",
+            model="gpt-5-nano"  # Writing a few query strings does not need a larger model
         )
     
+    async def check_connection(self):
+        """Send one cheap request through the HTTP client, raising on any failure."""
+        await self.client.with_options(max_retries=0, timeout=5).models.list()
+    
+    async def aclose(self):
+        """Close the underlying OpenAI client and its connection pool."""
+        await self.client.close()
+    
+    @property
+    def web_search_tool(self) -> WebSearchTool:
+        """WebSearchTool for the configured default context size"""
+        return self._tools[self.search_config.search_context_size]
+    
+    @property
+    def agent(self) -> Agent:
+        """Search agent for the configured default context size"""
+        return self._agents_by_ctx[self.search_config.search_context_size]
+    
+    def _search_agent(self, context_size: Optional[ContextSize] = None) -> Agent:
+        """Return the search agent for context_size, falling back to the configured default."""
+        return self._agents_by_ctx[context_size or self.search_config.search_context_size]
+    
     def update_search_config(
         self, 
         user_location: Optional[UserLocation] = None,
         filters: Optional[Filters] = None,
-        search_context_size: Optional[Literal["low", "medium", "high"]] = None
+        search_context_size: Optional[ContextSize] = None
     ):
         """
         Update the web search configuration.
@@ -82,60 +234,123 @@ class OpenAISearchAgent:
             search_context_size: Amount of context to use ("low", "medium", "high")
         """
         if user_location is not None:
-            self.search_config.user_location = user_location
-            self.web_search_tool.user_location = user_location
+            self.search_config = replace(self.search_config, user_location=user_location)
+            for tool in self._tools.values():
+                tool.user_location = user_location
         
         if filters is not None:
-            self.search_config.filters = filters
-            self.web_search_tool.filters = filters
+            self.search_config = replace(self.search_config, filters=filters)
+            for tool in self._tools.values():
+                tool.filters = filters
+        
+        if user_location is not None or filters is not None:
+            # Cached results were searched with the old location or filters
+            self._search_cached.cache_clear()
         
         if search_context_size is not None:
-            self.search_config.search_context_size = search_context_size
-            self.web_search_tool.search_context_size = search_context_size
+            # Only the default changes; each context size already has its own tool
+            self.search_config = replace(self.search_config, search_context_size=search_context_size)
     
-    async def search(self, query: str, context_size: Optional[Literal["low", "medium", "high"]] = None) -> Dict[str, Any]:
+    async def search(
+        self,
+        query: str,
+        context_size: Optional[ContextSize] = None,
+        no_cache: bool = False
+    ) -> Dict[str, Any]:
         """
         Perform a web search using the agent with WebSearchTool.
         
         Args:
             query: The search query
             context_size: Optional override for search context size
+            no_cache: Skip the result cache and always run a fresh search
             
         Returns:
             Dictionary containing the search results and agent response
         """
+        context_size = context_size or self.search_config.search_context_size
         try:
-            # Temporarily update context size if specified
-            original_context_size = self.web_search_tool.search_context_size
-            if context_size:
-                self.web_search_tool.search_context_size = context_size
-            
-            # Run the agent with the search query
-            result = Runner.run_sync(self.agent, query)
-            
-            # Restore original context size
-            if context_size:
-                self.web_search_tool.search_context_size = original_context_size
+            if no_cache:
+                response = await self._run_search(query, context_size)
+            else:
+                response = await self._search_cached(_NormalizedQuery(query), context_size)
             
             return {
                 "success": True,
                 "query": query,
-                "response": result.final_output,
+                "response": response,
                 "metadata": {
                     "model": "gpt-5-mini",
-                    "search_context_size": context_size or self.search_config.search_context_size,
-                    "tokens_used": getattr(result, 'tokens_used', None),
+                    "search_context_size": context_size,
                     "tool": "WebSearchTool"
                 }
             }
-        except Exception as e:
+        except RETRYABLE_ERRORS:
+            # Already retried with backoff; let the caller decide how to surface it
+            raise
+        except APIError as e:
             return {
                 "success": False,
                 "query": query,
-                "error": str(e),
+                "error": e.message,
                 "error_type": type(e).__name__
             }
     
+    async def _run_search(self, query: str, context_size: ContextSize) -> str:
+        """Run the agent for context_size with the search query and return its output."""
+        result = await self._with_retry(Runner.run, self._search_agent(context_size), query)
+        return result.final_output
+    
+    @alru_cache(maxsize=1024, ttl=300)
+    async def _search_cached(self, query: _NormalizedQuery, context_size: ContextSize) -> str:
+        """Cached _run_search; failures raise and are therefore never cached."""
+        return await self._run_search(query.text, context_size)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters and size of the search result cache."""
+        return self._search_cached.cache_info()._asdict()
+    
+    async def _with_retry(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Await func, retrying transient OpenAI errors with exponential backoff."""
+        for attempt in range(MAX_RETRY_ATTEMPTS):
+            try:
+                return await func(*args, **kwargs)
+            except RETRYABLE_ERRORS:
+                if attempt == MAX_RETRY_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(2 ** attempt + random.random())
+    
+    async def _bounded_search(
+        self,
+        query: str,
+        context_size: Optional[ContextSize] = None
+    ) -> Dict[str, Any]:
+        """Run a search while holding the concurrency semaphore."""
+        async with self._sem:
+            return await self.search(query, context_size=context_size)
+    
+    def _chat_agent(self, enable_search: bool) -> Agent:
+        """Return the agent to chat with, with or without the search tool."""
+        return self.agent if enable_search else self._chat_only_agent
+    
+    @staticmethod
+    def _build_chat_input(message: str, conversation_history: Optional[List[Dict[str, str]]] = None) -> str:
+        """Fold the conversation history into a single prompt for the agent."""
+        if not conversation_history:
+            return message
+        context = "\n".join([
+            f"{msg.get('role', 'user')}: {msg.get('content', '')}"
+            for msg in conversation_history
+        ])
+        return f"Conversation history:\n{context}\n\nCurrent message: {message}"
+    
+    async def _stream_text(self, agent: Agent, prompt: str) -> AsyncIterator[str]:
+        """Run the agent in streaming mode and yield output text deltas as they arrive."""
+        result = Runner.run_streamed(agent, prompt, run_config=self._stream_run_config)
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                yield event.data.delta
+    
     async def chat(
         self, 
         message: str, 
@@ -154,30 +369,11 @@ class OpenAISearchAgent:
             Dictionary containing the agent's response
         """
         try:
-            # Create agent with or without search tool based on enable_search
-            if enable_search:
-                agent = self.agent
-            else:
-                agent = Agent(
-                    name="ChatAssistant",
-                    instructions="""You are a helpful assistant. Provide clear, accurate,
-                    and helpful responses based on your knowledge.""",
-                    model="gpt-5-mini"
-                )
-            
-            # Build conversation context
-            if conversation_history:
-                # Format conversation history for the agent
-                context = "\n".join([
-                    f"{msg.get('role', 'user')}: {msg.get('content', '')}"
-                    for msg in conversation_history
-                ])
-                full_message = f"Conversation history:\n{context}\n\nCurrent message: {message}"
-            else:
-                full_message = message
+            agent = self._chat_agent(enable_search)
+            full_message = self._build_chat_input(message, conversation_history)
             
             # Run the agent
-            result = Runner.run_sync(agent, full_message)
+            result = await self._with_retry(Runner.run, agent, full_message)
             
             return {
                 "success": True,
@@ -190,14 +386,56 @@ class OpenAISearchAgent:
                     "tokens_used": getattr(result, 'tokens_used', None)
                 }
             }
-        except Exception as e:
+        except RETRYABLE_ERRORS:
+            raise
+        except APIError as e:
             return {
                 "success": False,
                 "message": message,
-                "error": str(e),
+                "error": e.message,
                 "error_type": type(e).__name__
             }
     
+    async def search_stream(
+        self,
+        query: str,
+        context_size: Optional[ContextSize] = None
+    ) -> AsyncIterator[str]:
+        """
+        Perform a web search, yielding the agent's response text as it is generated.
+        
+        Args:
+            query: The search query
+            context_size: Optional override for search context size
+            
+        Yields:
+            Chunks of the agent's response text
+        """
+        async for delta in self._stream_text(self._search_agent(context_size), query):
+            yield delta
+    
+    async def chat_stream(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        enable_search: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Have a conversation with the agent, yielding the response text as it is generated.
+        
+        Args:
+            message: The user's message
+            conversation_history: Optional conversation history
+            enable_search: Whether to enable web search for this conversation
+            
+        Yields:
+            Chunks of the agent's response text
+        """
+        agent = self._chat_agent(enable_search)
+        full_message = self._build_chat_input(message, conversation_history)
+        async for delta in self._stream_text(agent, full_message):
+            yield delta
+    
     async def multi_query_search(self, queries: List[str]) -> Dict[str, Any]:
         """
         Perform multiple searches and synthesize the results.
@@ -209,20 +447,22 @@ class OpenAISearchAgent:
             Dictionary containing synthesized results from all queries
         """
         try:
-            results = []
-            for query in queries:
-                result = await self.search(query)
-                if result["success"]:
-                    results.append({
-                        "query": query,
-                        "response": result["response"]
-                    })
+            # Run all searches concurrently; results come back in query order
+            raw_results = await asyncio.gather(
+                *(self._bounded_search(query) for query in queries),
+                return_exceptions=True
+            )
+            results = [
+                {"query": query, "response": result["response"]}
+                for query, result in zip(queries, raw_results)
+                if isinstance(result, dict) and result["success"]
+            ]
             
             # Synthesize results
             synthesis_prompt = f"""Based on the following search results for multiple queries,
             provide a comprehensive synthesis that addresses all queries:
             
-            {json.dumps(results, indent=2)}
+            {_format_results(results, "response")}
             
             Provide a well-organized response that:
             1. Addresses each query
@@ -230,7 +470,7 @@ class OpenAISearchAgent:
             3. Highlights any contradictions or different perspectives
             4. Provides a cohesive summary"""
             
-            synthesis_result = Runner.run_sync(self.agent, synthesis_prompt)
+            synthesis_result = await self._with_retry(Runner.run, self.agent, synthesis_prompt)
             
             return {
                 "success": True,
@@ -242,15 +482,45 @@ class OpenAISearchAgent:
                     "num_queries": len(queries)
                 }
             }
-        except Exception as e:
+        except RETRYABLE_ERRORS:
+            raise
+        except APIError as e:
             return {
                 "success": False,
                 "queries": queries,
-                "error": str(e),
+                "error": e.message,
                 "error_type": type(e).__name__
             }
     
-    async def research_topic(self, topic: str, depth: Literal["basic", "detailed", "comprehensive"] = "detailed") -> Dict[str, Any]:
+    async def _research_queries(self, topic: str, depth: ResearchDepth) -> Tuple[str, ...]:
+        """Return the search queries for researching topic at depth."""
+        if depth == "basic":
+            # Shallow research does not justify an LLM round-trip just to write queries
+            return tuple(template.format(topic=topic) for template in BASIC_QUERY_TEMPLATES)
+        return await self._generate_queries(topic, DEPTH_QUERY_COUNTS[depth])
+    
+    @alru_cache(maxsize=256, ttl=3600)
+    async def _generate_queries(self, topic: str, num_queries: int) -> Tuple[str, ...]:
+        """Ask the query generator agent for num_queries research queries."""
+        query_generation_prompt = f"""Generate {num_queries} 
+        specific search queries to thoroughly research the topic: "{topic}".
+        
+        The queries should cover:
+        - Overview and definition
+        - Current state and recent developments
+        - Key applications or implications
+        - Expert opinions or authoritative sources
+        - Future trends or predictions (if applicable)
+        
+        Return only the queries, one per line."""
+        
+        # Generate queries using the agent
+        query_result = await self._with_retry(Runner.run, self._query_gen_agent, query_generation_prompt)
+        
+        # Parse queries from response
+        return tuple(q.strip() for q in query_result.final_output.split('\n') if q.strip())
+    
+    async def research_topic(self, topic: str, depth: ResearchDepth = "detailed") -> Dict[str, Any]:
         """
         Conduct in-depth research on a topic using multiple search strategies.
         
@@ -263,83 +533,218 @@ class OpenAISearchAgent:
         """
         try:
             # Adjust context size based on depth
-            context_map = {
-                "basic": "low",
-                "detailed": "medium",
-                "comprehensive": "high"
-            }
-            context_size = context_map[depth]
-            
-            # Generate research queries based on depth
-            query_generation_prompt = f"""Generate {3 if depth == 'basic' else 5 if depth == 'detailed' else 7} 
-            specific search queries to thoroughly research the topic: "{topic}".
+            context_size = DEPTH_CONTEXT_SIZES[depth]
             
-            The queries should cover:
-            - Overview and definition
-            - Current state and recent developments
-            - Key applications or implications
-            - Expert opinions or authoritative sources
-            - Future trends or predictions (if applicable)
-            
-            Return only the queries, one per line."""
-            
-            # Generate queries using the agent
-            query_result = Runner.run_sync(
-                Agent(
-                    name="QueryGenerator",
-                    instructions="Generate focused search queries for research.",
-                    model="gpt-5-mini"
-                ),
-                query_generation_prompt
-            )
-            
-            # Parse queries from response
-            queries = [q.strip() for q in query_result.final_output.split('\n') if q.strip()]
+            queries = await self._research_queries(topic, depth)
             
             # Perform searches with appropriate context size
-            search_results = []
-            for query in queries:
-                result = await self.search(query, context_size=context_size)
-                if result["success"]:
-                    search_results.append({
-                        "query": query,
-                        "findings": result["response"]
-                    })
+            raw_results = await asyncio.gather(
+                *(self._bounded_search(query, context_size=context_size) for query in queries),
+                return_exceptions=True
+            )
+            search_results = [
+                {"query": query, "findings": result["response"]}
+                for query, result in zip(queries, raw_results)
+                if isinstance(result, dict) and result["success"]
+            ]
             
             # Compile comprehensive research report
-            report_prompt = f"""Based on the following research findings about "{topic}",
-            create a comprehensive research report:
+            report_result = await self._with_retry(Runner.run, self.agent, _report_prompt(topic, search_results))
             
-            {json.dumps(search_results, indent=2)}
+            return {
+                "success": True,
+                "topic": topic,
+                "depth": depth,
+                "research_queries": list(queries),
+                "findings": search_results,
+                "report": report_result.final_output,
+                "metadata": {
+                    "model": "gpt-5-mini",
+                    "context_size": context_size,
+                    "num_queries": len(queries)
+                }
+            }
+        except RETRYABLE_ERRORS:
+            raise
+        except APIError as e:
+            return {
+                "success": False,
+                "topic": topic,
+                "error": e.message,
+                "error_type": type(e).__name__
+            }
+    
+    async def research_topic_stream(self, topic: str, depth: ResearchDepth = "detailed") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Conduct research on a topic, yielding progress events as they happen.
+        
+        Each search's findings are yielded as soon as that search completes,
+        followed by the report text as it is generated.
+        
+        Args:
+            topic: The research topic
+            depth: Level of research depth
             
-            Structure your report with:
-            1. Executive Summary
-            2. Detailed Findings (organized by theme)
-            3. Key Insights and Implications
-            4. Sources and References
-            5. Conclusion
+        Yields:
+            Event dictionaries with a "type" of "queries", "finding",
+            "token" or "report_done"
+        """
+        context_size = DEPTH_CONTEXT_SIZES[depth]
+        queries = await self._research_queries(topic, depth)
+        yield {"type": "queries", "research_queries": list(queries)}
+        
+        tasks = [
+            asyncio.ensure_future(self._bounded_search(query, context_size=context_size))
+            for query in queries
+        ]
+        findings = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception:
+                    # Skip failed searches rather than ending the stream, as research_topic does
+                    continue
+                if result["success"]:
+                    findings[result["query"]] = result["response"]
+                    yield {"type": "finding", "query": result["query"], "findings": result["response"]}
+        finally:
+            # Stop outstanding searches if the client goes away mid-stream
+            for task in tasks:
+                task.cancel()
+        
+        # Report on findings in query order, as research_topic does
+        search_results = [
+            {"query": query, "findings": findings[query]}
+            for query in queries
+            if query in findings
+        ]
+        async for delta in self._stream_text(self.agent, _report_prompt(topic, search_results)):
+            yield {"type": "token", "token": delta}
+        yield {"type": "report_done"}
+    
+    async def research_topic_batch(self, topic: str, depth: ResearchDepth = "detailed") -> Dict[str, Any]:
+        """
+        Submit the searches for a research topic as an OpenAI Batch job.
+        
+        Batch jobs cost half as much and draw on a separate rate limit pool, but
+        complete asynchronously within 24 hours. Fetch the findings later with
+        get_research_batch.
+        
+        Args:
+            topic: The research topic
+            depth: Level of research depth
             
-            Make it thorough, well-organized, and properly cited."""
+        Returns:
+            Dictionary containing the batch id and the queries submitted
+        """
+        try:
+            context_size = DEPTH_CONTEXT_SIZES[depth]
+            queries = await self._research_queries(topic, depth)
             
-            report_result = Runner.run_sync(self.agent, report_prompt)
+            # One Responses API request per query, with the web search tool enabled
+            lines = [
+                orjson.dumps({
+                    "custom_id": f"query-{i}",
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {
+                        "model": "gpt-5-mini",
+                        "instructions": SEARCH_AGENT_INSTRUCTIONS,
+                        "input": query,
+                        "tools": [{"type": "web_search", "search_context_size": context_size}]
+                    }
+                })
+                for i, query in enumerate(queries)
+            ]
+            input_file = await self.client.files.create(
+                file=("research.jsonl", b"\n".join(lines)),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window="24h",
+                metadata={"topic": topic[:512], "depth": depth}
+            )
             
             return {
                 "success": True,
+                "batch_id": batch.id,
+                "status": batch.status,
                 "topic": topic,
                 "depth": depth,
-                "research_queries": queries,
-                "findings": search_results,
-                "report": report_result.final_output,
+                "research_queries": list(queries),
                 "metadata": {
                     "model": "gpt-5-mini",
                     "context_size": context_size,
                     "num_queries": len(queries)
                 }
             }
-        except Exception as e:
+        except RETRYABLE_ERRORS:
+            raise
+        except APIError as e:
             return {
                 "success": False,
                 "topic": topic,
-                "error": str(e),
+                "error": e.message,
+                "error_type": type(e).__name__
+            }
+    
+    async def get_research_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Fetch the status and, once completed, the findings of a research batch.
+        
+        Args:
+            batch_id: Id returned by research_topic_batch
+            
+        Returns:
+            Dictionary containing the batch status and any findings
+        """
+        try:
+            batch = await self.client.batches.retrieve(batch_id)
+            result = {
+                "success": True,
+                "batch_id": batch.id,
+                "status": batch.status,
+                "topic": (batch.metadata or {}).get("topic"),
+                "depth": (batch.metadata or {}).get("depth"),
+                "request_counts": batch.request_counts.model_dump() if batch.request_counts else None
+            }
+            if batch.status != "completed" or not batch.output_file_id:
+                return result
+            
+            # Map custom ids back to the submitted queries
+            input_content = await self.client.files.content(batch.input_file_id)
+            queries = {}
+            for line in input_content.text.splitlines():
+                if line.strip():
+                    request = orjson.loads(line)
+                    queries[request["custom_id"]] = request["body"]["input"]
+            
+            output_content = await self.client.files.content(batch.output_file_id)
+            answers = {}
+            for line in output_content.text.splitlines():
+                if not line.strip():
+                    continue
+                item = orjson.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") == 200:
+                    answers[item["custom_id"]] = _response_output_text(response.get("body") or {})
+            
+            # Output lines are not guaranteed to be in input order
+            result["findings"] = [
+                {"query": query, "findings": answers[custom_id]}
+                for custom_id, query in queries.items()
+                if custom_id in answers
+            ]
+            return result
+        except RETRYABLE_ERRORS:
+            raise
+        except APIError as e:
+            return {
+                "success": False,
+                "batch_id": batch_id,
+                "error": e.message,
                 "error_type": type(e).__name__
             }
@@ -1,36 +1,32 @@
 """API routes for the OpenAI WebSearchTool agent"""
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Literal
-from ..agents import OpenAISearchAgent, SearchConfig
-from ..config import settings
+from typing import List, Optional, Dict, Any, Literal, AsyncIterator
+from openai import RateLimitError, APIConnectionError, APITimeoutError
+from ..agents import OpenAISearchAgent
 
 router = APIRouter()
 
-# Initialize the OpenAI WebSearchTool agent
-search_agent = None
+# The OpenAI WebSearchTool agent itself is created in the app lifespan (see main.py)
 agent_provider = "openai-websearch"
 agent_model = "gpt-5-mini"
 
-# Initialize agent if API key is available
-if settings.openai_api_key:
-    try:
-        search_agent = OpenAISearchAgent(api_key=settings.openai_api_key)
-    except Exception as e:
-        print(f"Warning: Failed to initialize search agent: {e}")
-else:
-    print("Warning: OPENAI_API_KEY not found in environment variables")
-
 
 class SearchRequest(BaseModel):
     """Search request model"""
-    query: str = Field(..., description="The search query")
+    query: str = Field(..., min_length=1, max_length=4096, description="The search query")
     num_results: int = Field(default=5, ge=1, le=20, description="Number of results to return")
     context_size: Optional[Literal["low", "medium", "high"]] = Field(
         default=None,
         description="Search context size (for WebSearchTool)"
     )
+    no_cache: bool = Field(
+        default=False,
+        description="Bypass the search result cache for freshness-sensitive queries"
+    )
 
 
 class ChatRequest(BaseModel):
@@ -78,6 +74,76 @@ class ChatResponse(BaseModel):
     error: Optional[str] = None
 
 
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload as a single Server-Sent Event."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def token_stream(deltas: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Encode agent text deltas as Server-Sent Events, ending with a done event."""
+    try:
+        async for delta in deltas:
+            yield _sse({"token": delta})
+    except Exception as e:
+        # Headers are already sent, so report failures in-band
+        yield _sse({"error": str(e), "error_type": type(e).__name__})
+    yield _sse({"done": True})
+
+
+async def event_stream(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode agent event dictionaries as Server-Sent Events."""
+    try:
+        async for event in events:
+            yield _sse(event)
+    except Exception as e:
+        yield _sse({"type": "error", "error": str(e), "error_type": type(e).__name__})
+
+
+def _json_body_schema(model: type) -> Dict[str, Any]:
+    """OpenAPI requestBody for endpoints that parse their JSON body by hand."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
+
+
+async def _json_body(request: Request) -> Dict[str, Any]:
+    """Parse the request body as a JSON object, or raise a 422."""
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=422, detail="Request body must be valid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object")
+    return body
+
+
+def _upstream_error(e: Exception) -> HTTPException:
+    """Map an OpenAI error that outlasted the agent's retries to a status clients can act on."""
+    if isinstance(e, RateLimitError):
+        return HTTPException(status_code=429, detail="OpenAI rate limit reached, retry later")
+    # APITimeoutError subclasses APIConnectionError, so check it first
+    if isinstance(e, APITimeoutError):
+        return HTTPException(status_code=504, detail="OpenAI request timed out")
+    return HTTPException(status_code=503, detail="Could not reach OpenAI")
+
+
+def get_agent(request: Request) -> OpenAISearchAgent:
+    """Dependency returning the search agent created at startup, or a 503 if there is none."""
+    search_agent = getattr(request.app.state, "search_agent", None)
+    if not search_agent:
+        raise HTTPException(
+            status_code=503, 
+            detail="Search agent not initialized. Please check OPENAI_API_KEY in .env file"
+        )
+    return search_agent
+
+
 @router.get("/")
 async def root():
     """Root endpoint"""
@@ -87,76 +153,148 @@ async def root():
         "endpoints": {
             "search": "/api/search",
             "chat": "/api/chat",
+            "search_stream": "/api/search/stream",
+            "chat_stream": "/api/chat/stream",
             "health": "/api/health"
         }
     }
 
 
 @router.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
-    return {"status": "healthy", "service": "search-agent"}
+    search_agent = getattr(request.app.state, "search_agent", None)
+    return {
+        "status": "healthy",
+        "service": "search-agent",
+        "search_cache": search_agent.cache_stats() if search_agent else None
+    }
 
 
-@router.post("/search", response_model=SearchResponse)
-async def search(request: SearchRequest):
+@router.post(
+    "/search",
+    responses={200: {"model": SearchResponse}},
+    openapi_extra=_json_body_schema(SearchRequest)
+)
+async def search(request: Request, search_agent: OpenAISearchAgent = Depends(get_agent)):
     """
     Perform a search using the agent.
     
+    The body is validated by hand rather than through SearchRequest, since
+    this is the hottest endpoint and its shape is small.
+    
     Args:
-        request: Search request containing the query
+        request: Request whose JSON body matches SearchRequest
         
     Returns:
         Search results from the agent
     """
-    if not search_agent:
-        raise HTTPException(
-            status_code=503, 
-            detail="Search agent not initialized. Please check OPENAI_API_KEY in .env file"
-        )
+    body = await _json_body(request)
+    query = body.get("query")
+    if not isinstance(query, str) or not 1 <= len(query) <= 4096:
+        raise HTTPException(status_code=422, detail="query must be a string of 1 to 4096 characters")
+    num_results = body.get("num_results", 5)
+    if type(num_results) is not int or not 1 <= num_results <= 20:
+        raise HTTPException(status_code=422, detail="num_results must be an integer between 1 and 20")
+    context_size = body.get("context_size")
+    if context_size not in (None, "low", "medium", "high"):
+        raise HTTPException(status_code=422, detail="context_size must be one of 'low', 'medium', 'high'")
+    no_cache = body.get("no_cache", False)
+    if not isinstance(no_cache, bool):
+        raise HTTPException(status_code=422, detail="no_cache must be a boolean")
     
     try:
-        # Use context_size for OpenAI WebSearch agent
-        if agent_provider == "openai-websearch" and hasattr(search_agent, 'search'):
-            result = await search_agent.search(request.query, context_size=request.context_size)
-        else:
-            result = await search_agent.search(request.query)
-        return SearchResponse(**result)
+        return await search_agent.search(query, context_size=context_size, no_cache=no_cache)
+    except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+        raise _upstream_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+@router.post(
+    "/chat",
+    responses={200: {"model": ChatResponse}},
+    openapi_extra=_json_body_schema(ChatRequest)
+)
+async def chat(request: Request, search_agent: OpenAISearchAgent = Depends(get_agent)):
     """
     Chat with the agent.
     
+    The body is validated by hand rather than through ChatRequest.
+    
     Args:
-        request: Chat request containing the message and optional history
+        request: Request whose JSON body matches ChatRequest
         
     Returns:
         Agent's response
     """
+    body = await _json_body(request)
+    message = body.get("message")
+    if not isinstance(message, str):
+        raise HTTPException(status_code=422, detail="message must be a string")
+    conversation_history = body.get("conversation_history")
+    if conversation_history is not None and not (
+        isinstance(conversation_history, list)
+        and all(
+            isinstance(msg, dict) and all(isinstance(v, str) for v in msg.values())
+            for msg in conversation_history
+        )
+    ):
+        raise HTTPException(status_code=422, detail="conversation_history must be a list of string-valued objects")
+    enable_search = body.get("enable_search", True)
+    if not isinstance(enable_search, bool):
+        raise HTTPException(status_code=422, detail="enable_search must be a boolean")
+    
     try:
-        # Use enable_search for OpenAI WebSearch agent
-        if agent_provider == "openai-websearch" and hasattr(search_agent, 'chat'):
-            result = await search_agent.chat(
-                request.message,
-                request.conversation_history,
-                enable_search=request.enable_search
-            )
-        else:
-            result = await search_agent.chat(
-                request.message,
-                request.conversation_history
-            )
-        return ChatResponse(**result)
+        return await search_agent.chat(message, conversation_history, enable_search=enable_search)
+    except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+        raise _upstream_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/search/stream")
+async def search_stream(request: SearchRequest, search_agent: OpenAISearchAgent = Depends(get_agent)):
+    """
+    Perform a search, streaming the agent's response as Server-Sent Events.
+    
+    Args:
+        request: Search request containing the query
+        
+    Returns:
+        Event stream of response tokens
+    """
+    return StreamingResponse(
+        token_stream(search_agent.search_stream(request.query, context_size=request.context_size)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, search_agent: OpenAISearchAgent = Depends(get_agent)):
+    """
+    Chat with the agent, streaming its response as Server-Sent Events.
+    
+    Args:
+        request: Chat request containing the message and optional history
+        
+    Returns:
+        Event stream of response tokens
+    """
+    return StreamingResponse(
+        token_stream(search_agent.chat_stream(
+            request.message,
+            request.conversation_history,
+            enable_search=request.enable_search
+        )),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.post("/search/structured", response_model=SearchResponse)
-async def structured_search(request: SearchRequest):
+async def structured_search(request: SearchRequest, search_agent: OpenAISearchAgent = Depends(get_agent)):
     """
     Perform a structured search using OpenAI's Responses API.
     Returns results in a structured JSON format.
@@ -177,12 +315,14 @@ async def structured_search(request: SearchRequest):
                 status_code=400, 
                 detail="Structured search is only available with OpenAI provider"
             )
+    except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+        raise _upstream_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/search/multi-query")
-async def multi_query_search(request: MultiQueryRequest):
+async def multi_query_search(request: MultiQueryRequest, search_agent: OpenAISearchAgent = Depends(get_agent)):
     """
     Perform multiple searches and synthesize the results.
     Only available with OpenAI WebSearch agent.
@@ -194,7 +334,7 @@ async def multi_query_search(request: MultiQueryRequest):
         Synthesized results from all queries
     """
     try:
-        if agent_provider == "openai-websearch" and hasattr(search_agent, 'multi_query_search'):
+        if agent_provider == "openai-websearch":
             result = await search_agent.multi_query_search(request.queries)
             return result
         else:
@@ -204,12 +344,14 @@ async def multi_query_search(request: MultiQueryRequest):
             )
     except HTTPException:
         raise
+    except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+        raise _upstream_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/research")
-async def research_topic(request: ResearchRequest):
+async def research_topic(request: ResearchRequest, search_agent: OpenAISearchAgent = Depends(get_agent)):
     """
     Conduct in-depth research on a topic.
     Only available with OpenAI WebSearch agent.
@@ -221,7 +363,7 @@ async def research_topic(request: ResearchRequest):
         Comprehensive research results
     """
     try:
-        if agent_provider == "openai-websearch" and hasattr(search_agent, 'research_topic'):
+        if agent_provider == "openai-websearch":
             result = await search_agent.research_topic(request.topic, request.depth)
             return result
         else:
@@ -231,6 +373,65 @@ async def research_topic(request: ResearchRequest):
             )
     except HTTPException:
         raise
+    except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+        raise _upstream_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/research/stream")
+async def research_topic_stream(request: ResearchRequest, search_agent: OpenAISearchAgent = Depends(get_agent)):
+    """
+    Conduct in-depth research on a topic, streaming progress as Server-Sent Events.
+    
+    Args:
+        request: Research request containing the topic and depth
+        
+    Returns:
+        Event stream of findings as each search completes, then the report tokens
+    """
+    return StreamingResponse(
+        event_stream(search_agent.research_topic_stream(request.topic, request.depth)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post("/research/batch")
+async def research_topic_batch(request: ResearchRequest, search_agent: OpenAISearchAgent = Depends(get_agent)):
+    """
+    Submit research on a topic as an OpenAI Batch job.
+    Batch jobs cost less but complete asynchronously (within 24 hours).
+    
+    Args:
+        request: Research request containing the topic and depth
+        
+    Returns:
+        The batch id to poll with GET /api/research/batch/{batch_id}
+    """
+    try:
+        return await search_agent.research_topic_batch(request.topic, request.depth)
+    except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+        raise _upstream_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/research/batch/{batch_id}")
+async def get_research_batch(batch_id: str, search_agent: OpenAISearchAgent = Depends(get_agent)):
+    """
+    Get the status of a research batch job, with its findings once completed.
+    
+    Args:
+        batch_id: Id returned by POST /api/research/batch
+        
+    Returns:
+        Batch status and findings
+    """
+    try:
+        return await search_agent.get_research_batch(batch_id)
+    except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+        raise _upstream_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -261,10 +462,15 @@ async def agent_info():
             "Real-time web search (WebSearchTool)",
             "Multi-query synthesis",
             "In-depth research",
+            "Batch research",
             "Configurable search context"
         ])
+        endpoints["search_stream"] = "/api/search/stream"
+        endpoints["chat_stream"] = "/api/chat/stream"
         endpoints["multi_query_search"] = "/api/search/multi-query"
         endpoints["research"] = "/api/research"
+        endpoints["research_stream"] = "/api/research/stream"
+        endpoints["research_batch"] = "/api/research/batch"
         tools = ["WebSearchTool"]
     
     return {
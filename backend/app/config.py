@@ -1,7 +1,7 @@
 """Application configuration"""
 
 import os
-from typing import Optional
+from typing import List, Literal
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -19,11 +19,26 @@ class Settings:
     port: int = int(os.getenv("PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "True").lower() == "true"
     
-    # CORS Configuration
-    allowed_origins: list = os.getenv(
-        "ALLOWED_ORIGINS", 
-        "http://localhost:3000,http://localhost:3001"
-    ).split(",")
+    # Agent Configuration
+    max_concurrency: int = int(os.getenv("MAX_CONCURRENCY", "10"))
+    
+    # OpenAI HTTP client connection pool
+    openai_transport: Literal["httpx", "aiohttp"] = os.getenv("OPENAI_TRANSPORT", "aiohttp")
+    httpx_max_keepalive_connections: int = int(os.getenv("HTTPX_MAX_KEEPALIVE_CONNECTIONS", "50"))
+    httpx_max_connections: int = int(os.getenv("HTTPX_MAX_CONNECTIONS", "100"))
+    httpx_keepalive_expiry: float = float(os.getenv("HTTPX_KEEPALIVE_EXPIRY", "30.0"))
+    # Non-streamed agent runs send nothing until they finish, so this must outlast them
+    openai_timeout: float = float(os.getenv("OPENAI_TIMEOUT", "600.0"))
+    
+    # CORS Configuration (parsed once at import)
+    allowed_origins: List[str] = [
+        origin.strip()
+        for origin in os.getenv(
+            "ALLOWED_ORIGINS", 
+            "http://localhost:3000,http://localhost:3001"
+        ).split(",")
+        if origin.strip()
+    ]
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,24 @@
+"""Pooled HTTP client used by the OpenAI clients"""
+
+import httpx
+import openai
+from openai import DefaultAioHttpClient
+from .config import settings
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client for the configured transport."""
+    limits = httpx.Limits(
+        max_keepalive_connections=settings.httpx_max_keepalive_connections,
+        max_connections=settings.httpx_max_connections,
+        keepalive_expiry=settings.httpx_keepalive_expiry
+    )
+    
+    # The aiohttp transport holds up under high concurrency where the
+    # default httpx transport does not. It is built on the SDK's own HTTP
+    # stack, which needs the SDK's Timeout type rather than httpx's.
+    if settings.openai_transport == "aiohttp":
+        return DefaultAioHttpClient(limits=limits, timeout=openai.Timeout(settings.openai_timeout, connect=5.0))
+    if settings.openai_transport == "httpx":
+        return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(settings.openai_timeout, connect=5.0), http2=True)
+    raise ValueError(f"Unsupported OPENAI_TRANSPORT: {settings.openai_transport!r}")
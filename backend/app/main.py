@@ -1,17 +1,51 @@
 """Main FastAPI application"""
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from .agents import OpenAISearchAgent
 from .api import router
 from .config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Initialize the OpenAI WebSearchTool agent if API key is available
+    app.state.search_agent = None
+    if settings.openai_api_key:
+        try:
+            app.state.search_agent = OpenAISearchAgent(
+                api_key=settings.openai_api_key,
+                max_concurrency=settings.max_concurrency
+            )
+        except Exception as e:
+            print(f"Warning: Failed to initialize search agent: {e}")
+        
+        if app.state.search_agent:
+            # Surface a broken OPENAI_TRANSPORT setup at startup rather than on the first request
+            try:
+                await app.state.search_agent.check_connection()
+            except Exception as e:
+                print(f"Warning: OpenAI connection check failed ({type(e).__name__}): {e}")
+    else:
+        print("Warning: OPENAI_API_KEY not found in environment variables")
+    
+    yield
+    
+    # Closing the agent closes its OpenAI client and the pooled connections under it
+    if app.state.search_agent:
+        await app.state.search_agent.aclose()
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Search Agent API",
     description="A search agent powered by OpenAI Agents SDK",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
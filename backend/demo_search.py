@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """Demo: GPT-5 mini with WebSearchTool - Learning from web and summarizing"""
 
-import os
+import asyncio
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-def demo_web_search():
+async def demo_web_search():
     """Demonstrate GPT-5 mini learning from web search and summarizing"""
     
     print("🚀 GPT-5 Mini WebSearchTool Demo")
@@ -58,25 +58,29 @@ def demo_web_search():
             }
         ]
         
-        for i, item in enumerate(queries, 1):
+        # Run all searches concurrently; gather returns results in query order
+        print("\n⏳ Running all queries concurrently...")
+        results = await asyncio.gather(
+            *(Runner.run(agent, item['query']) for item in queries),
+            return_exceptions=True
+        )
+        
+        for i, (item, result) in enumerate(zip(queries, results), 1):
             print(f"\n{'='*70}")
             print(f"🔍 Query {i}: {item['description']}")
             print(f"{'='*70}")
             print(f"Question: {item['query']}")
             print("-" * 70)
             
-            try:
-                # Run the search and get GPT-5 mini's summary
-                result = Runner.run_sync(agent, item['query'])
-                
-                print("✅ GPT-5 Mini Response (with web search):")
-                print("-" * 70)
-                print(result.final_output)
-                print("-" * 70)
-                print(f"📊 Response length: {len(result.final_output)} characters")
-                
-            except Exception as e:
-                print(f"❌ Error: {e}")
+            if isinstance(result, Exception):
+                print(f"❌ Error: {result}")
+                continue
+            
+            print("✅ GPT-5 Mini Response (with web search):")
+            print("-" * 70)
+            print(result.final_output)
+            print("-" * 70)
+            print(f"📊 Response length: {len(result.final_output)} characters")
         
         print("\n" + "=" * 70)
         print("✨ Demo Complete!")
@@ -97,6 +101,6 @@ def demo_web_search():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    demo_web_search()
+    asyncio.run(demo_web_search())
 
 
@@ -0,0 +1,5 @@
+"""Agent instructions shared by the standalone app and the test script"""
+
+# Shared by every agent so all requests send a byte-identical prompt prefix
+INSTRUCTIONS = """You are a helpful search assistant with real-time web search capabilities.
+Provide accurate, well-sourced information and always cite your sources."""
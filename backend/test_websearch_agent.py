@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
-"""Direct synchronous test of OpenAI WebSearchTool"""
+"""Direct test of OpenAI WebSearchTool"""
 
-import os
+import asyncio
 from dotenv import load_dotenv
+from prompts import INSTRUCTIONS
 
 # Load environment variables
 load_dotenv()
 
-def test_websearch():
+
+async def run_websearch_test():
     """Test WebSearchTool directly"""
     
     print("🚀 Testing OpenAI WebSearchTool")
@@ -29,8 +31,7 @@ def test_websearch():
         print("\n2️⃣ Creating agent...")
         agent = Agent(
             name="WebSearchAgent",
-            instructions="""You are a helpful search assistant with real-time web search.
-            Provide accurate, current information and cite your sources.""",
+            instructions=INSTRUCTIONS,
             tools=[web_search],
             model="gpt-5-mini"  # Use GPT-5 mini - smallest GPT-5 model
         )
@@ -43,26 +44,37 @@ def test_websearch():
             "Explain quantum computing in simple terms"
         ]
         
-        for i, query in enumerate(queries, 1):
-            print(f"\n{i}️⃣ Testing query: '{query}'")
-            print("-" * 60)
+        # Run all queries concurrently; results come back in query order
+        results = await asyncio.gather(
+            *[Runner.run(agent, q) for q in queries],
+            return_exceptions=True
+        )
+        
+        for i, (query, result) in enumerate(zip(queries, results), 1):
+            header = f"\n{i}️⃣ Testing query: '{query}'\n" + "-" * 60
             
-            try:
-                result = Runner.run_sync(agent, query)
-                print(f"✅ Search successful!")
-                print(f"Response preview: {result.final_output[:400]}...")
-                print(f"Response length: {len(result.final_output)} characters")
-            except Exception as e:
-                print(f"❌ Search failed: {e}")
+            if isinstance(result, Exception):
+                print(f"{header}\n❌ Search failed: {result}")
+                continue
+            out = result.final_output
+            print("\n".join([
+                header,
+                "✅ Search successful!",
+                f"Response preview: {out[:400]}...",
+                f"Response length: {len(out)} characters"
+            ]))
         
-        print("\n" + "=" * 60)
-        print("✨ Testing complete!")
-        print("\n📊 Key Features Verified:")
-        print("  ✅ WebSearchTool initialization")
-        print("  ✅ Agent creation with web search capability")
-        print("  ✅ Real-time web searches")
-        print("  ✅ Current information retrieval")
-        print("  ✅ Source citation in responses")
+        msg = "\n".join([
+            "\n" + "=" * 60,
+            "✨ Testing complete!",
+            "\n📊 Key Features Verified:",
+            "  ✅ WebSearchTool initialization",
+            "  ✅ Agent creation with web search capability",
+            "  ✅ Real-time web searches",
+            "  ✅ Current information retrieval",
+            "  ✅ Source citation in responses"
+        ])
+        print(msg)
         
     except ImportError as e:
         print(f"❌ Import error: {e}")
@@ -73,4 +85,4 @@ def test_websearch():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    test_websearch()
+    asyncio.run(run_websearch_test())
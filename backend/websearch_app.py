@@ -2,35 +2,48 @@
 """Simple FastAPI app with OpenAI WebSearchTool - minimal dependencies"""
 
 import os
+import time
+import orjson
 import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import httpx
+import numpy as np
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Optional, Literal, Dict, List, Tuple, AsyncIterator, Awaitable, Callable, TypeVar
 from dotenv import load_dotenv
+from prompts import INSTRUCTIONS
+
+try:
+    from agents import Agent, Runner, set_default_openai_client
+    from agents.tool import WebSearchTool
+    from openai import AsyncOpenAI
+    from openai.types.responses import ResponseTextDeltaEvent
+    AGENTS_AVAILABLE = True
+    AGENTS_IMPORT_ERROR = None
+except ImportError as e:
+    AGENTS_AVAILABLE = False
+    AGENTS_IMPORT_ERROR = e
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="OpenAI WebSearch Agent API")
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+T = TypeVar("T")
 
 # Request/Response models
 class SearchRequest(BaseModel):
-    query: str = Field(..., description="The search query")
+    query: str = Field(..., min_length=1, max_length=4096, description="The search query")
     context_size: Optional[Literal["low", "medium", "high"]] = Field(
         default="medium",
         description="Search context size"
     )
 
+class ChatRequest(BaseModel):
+    message: str = Field(..., min_length=1, max_length=8192, description="The user's message")
+
 class SearchResponse(BaseModel):
     success: bool
     query: str
@@ -39,37 +52,179 @@ class SearchResponse(BaseModel):
     error: Optional[str] = None
 
 
-# Initialize agent on startup
-agent = None
+# Initialize agents on startup, one per search context size
+AGENTS: Dict[str, "Agent"] = {}
+openai_client = None
+
+# Cap on concurrent agent runs; excess requests queue here instead of piling
+# into the HTTP layer. The cap is per worker process, so set it to the OpenAI
+# tier's ceiling divided by WORKERS.
+AGENT_SEM = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_AGENT", "16")))
+
+# Exact-match cache: (query, context_size) -> (expires_at, response), least
+# recently used first. Entries expire so real-time answers are not replayed forever.
+EXACT: OrderedDict[Tuple[str, str], Tuple[float, str]] = OrderedDict()
+MAXSIZE = 4096
+EXACT_TTL = 300
+
+
+def exact_lookup(key: Tuple[str, str]) -> Optional[str]:
+    """Return the cached response for an identical earlier request, unless it has expired"""
+    entry = EXACT.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if expires_at <= time.monotonic():
+        del EXACT[key]
+        return None
+    EXACT.move_to_end(key)
+    return response
+
+
+def exact_store(key: Tuple[str, str], response: str):
+    """Cache a response, evicting the least recently used entry when full"""
+    EXACT[key] = (time.monotonic() + EXACT_TTL, response)
+    EXACT.move_to_end(key)
+    if len(EXACT) > MAXSIZE:
+        EXACT.popitem(last=False)
+
+
+# Runs in progress, so identical concurrent requests share one agent run
+INFLIGHT: Dict[Tuple[str, str], asyncio.Future] = {}
+
+# Semantic cache: entries per context size, cosine similarity needed for a hit, lifetime
+SEMANTIC_CACHE_MAXSIZE = 1000
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_TTL = 300
+EMBEDDING_MODEL = "text-embedding-3-small"
+
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the OpenAI agent with WebSearchTool"""
-    global agent
+class SemanticCache:
+    """Ring buffer of unit query embeddings and responses for one context size.
+    
+    The embeddings live in one preallocated matrix that is overwritten in
+    place, so a lookup is a single matrix-vector product with no copying.
+    """
+    
+    def __init__(self, dim: int):
+        self.vectors = np.zeros((SEMANTIC_CACHE_MAXSIZE, dim), dtype=np.float32)
+        # Free slots have expired at time 0, so they never match
+        self.expires_at = np.zeros(SEMANTIC_CACHE_MAXSIZE)
+        self.responses: List[Optional[str]] = [None] * SEMANTIC_CACHE_MAXSIZE
+        self.next_slot = 0
+    
+    def lookup(self, vector: np.ndarray) -> Optional[str]:
+        """Return the response for the most similar live query, if close enough"""
+        similarities = self.vectors @ vector
+        similarities[self.expires_at <= time.monotonic()] = -np.inf
+        best = int(np.argmax(similarities))
+        if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        return self.responses[best]
+    
+    def store(self, vector: np.ndarray, response: str):
+        """Cache a response, overwriting the oldest slot when full"""
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.expires_at[slot] = time.monotonic() + SEMANTIC_CACHE_TTL
+        self.responses[slot] = response
+        self.next_slot = (slot + 1) % SEMANTIC_CACHE_MAXSIZE
+
+
+# Semantic cache per context size, created on first store
+SEMANTIC_CACHE: Dict[str, SemanticCache] = {}
+
+
+async def embed(query: str) -> np.ndarray:
+    """Embed a query as a unit vector so dot products are cosine similarities"""
+    response = await openai_client.embeddings.create(model=EMBEDDING_MODEL, input=query)
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def semantic_lookup(vector: np.ndarray, context_size: str) -> Optional[str]:
+    """Return the cached response for the most similar earlier query, if close enough"""
+    cache = SEMANTIC_CACHE.get(context_size)
+    return cache.lookup(vector) if cache is not None else None
+
+
+def semantic_store(vector: np.ndarray, context_size: str, response: str):
+    """Cache a response for later similar queries"""
+    cache = SEMANTIC_CACHE.get(context_size)
+    if cache is None:
+        cache = SEMANTIC_CACHE[context_size] = SemanticCache(len(vector))
+    cache.store(vector, response)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the OpenAI agents with WebSearchTool and warm up the client"""
+    global openai_client
+    
+    if not AGENTS_AVAILABLE:
+        print(f"❌ Failed to import openai-agents: {AGENTS_IMPORT_ERROR}")
+        print("Install with: pip install openai-agents>=0.2.11 openai>=1.104.1")
+        yield
+        return
     
     try:
-        from agents import Agent
-        from agents.tool import WebSearchTool
-        
-        # Create WebSearchTool
-        web_search = WebSearchTool(search_context_size="medium")
-        
-        # Create agent
-        agent = Agent(
-            name="WebSearchAssistant",
-            instructions="""You are a helpful search assistant with real-time web search capabilities.
-            Provide accurate, well-sourced information and always cite your sources.""",
-            tools=[web_search],
-            model="gpt-5-mini"  # Use GPT-5 mini - smallest GPT-5 model
+        # One OpenAI client on a large HTTP/2 connection pool, shared by the agents
+        # SDK and the semantic cache's embedding calls
+        openai_client = AsyncOpenAI(
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=512, max_keepalive_connections=256),
+                http2=True,
+                timeout=60
+            )
         )
+        set_default_openai_client(openai_client)
+        
+        # Create one WebSearchTool and agent per context size, so requests never
+        # have to swap tools on a shared agent
+        AGENTS.update({
+            cs: Agent(
+                name="WebSearchAssistant",
+                instructions=INSTRUCTIONS,
+                tools=[WebSearchTool(search_context_size=cs)],
+                model="gpt-5-mini"  # Use GPT-5 mini - smallest GPT-5 model
+            )
+            for cs in ("low", "medium", "high")
+        })
         
         print("✅ OpenAI WebSearchTool agent initialized successfully!")
         
-    except ImportError as e:
-        print(f"❌ Failed to import openai-agents: {e}")
-        print("Install with: pip install openai-agents>=0.2.11 openai>=1.104.1")
     except Exception as e:
         print(f"❌ Failed to initialize agent: {e}")
+    
+    if AGENTS:
+        # One cheap, tool-free call so the shared client's connection pool is set up
+        # before the first real request arrives. Skip retries and keep the timeout
+        # short so a boot without network does not stall startup.
+        try:
+            await openai_client.with_options(max_retries=0, timeout=5).models.list()
+            print("✅ OpenAI client warmed up")
+        except Exception as e:
+            print(f"⚠️ OpenAI client warm-up failed: {e}")
+    
+    yield
+    
+    if openai_client is not None:
+        await openai_client.close()
+
+
+app = FastAPI(
+    title="OpenAI WebSearch Agent API",
+    lifespan=lifespan
+)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
 
 
 @app.get("/")
@@ -78,10 +233,11 @@ async def root():
     return {
         "message": "OpenAI WebSearch Agent API",
         "version": "1.0.0",
-        "status": "running" if agent else "agent not initialized",
+        "status": "running" if AGENTS else "agent not initialized",
         "endpoints": {
             "health": "/api/health",
             "search": "/api/search",
+            "search_stream": "/api/search/stream",
             "agent_info": "/api/agent/info"
         }
     }
@@ -92,14 +248,14 @@ async def health():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "agent_ready": agent is not None
+        "agent_ready": bool(AGENTS)
     }
 
 
 @app.get("/api/agent/info")
 async def agent_info():
     """Get agent information"""
-    if not agent:
+    if not AGENTS:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
     return {
@@ -115,37 +271,78 @@ async def agent_info():
     }
 
 
+async def coalesce(key: Tuple[str, str], compute: Callable[[], Awaitable[T]]) -> T:
+    """Await compute() once per key; concurrent callers with the same key share its result"""
+    task = INFLIGHT.get(key)
+    if task is None:
+        # Run in a task of its own so a cancelled caller, the first one included,
+        # cannot cancel the run out from under the others
+        task = asyncio.ensure_future(compute())
+        INFLIGHT[key] = task
+        task.add_done_callback(lambda done: _finish_inflight(key, done))
+    return await asyncio.shield(task)
+
+
+def _finish_inflight(key: Tuple[str, str], task: asyncio.Future):
+    """Forget a finished run, marking its exception retrieved in case every caller left"""
+    del INFLIGHT[key]
+    if not task.cancelled():
+        task.exception()
+
+
+async def _run_uncached(agent: "Agent", key: Tuple[str, str], query: str, semantic: bool) -> Tuple[str, bool]:
+    """Answer from the semantic cache or run the agent; returns (output, cache_hit)"""
+    vector = None
+    if semantic:
+        try:
+            vector = await embed(query)
+        except Exception as e:
+            print(f"⚠️ Embedding failed, skipping semantic cache: {e}")
+    if vector is not None:
+        cached = semantic_lookup(vector, key[1])
+        if cached is not None:
+            return cached, True
+    
+    # Run the agent on the event loop, queueing behind the concurrency cap
+    async with AGENT_SEM:
+        result = await Runner.run(agent, query)
+    exact_store(key, result.final_output)
+    if vector is not None:
+        semantic_store(vector, key[1], result.final_output)
+    return result.final_output, False
+
+
+async def _run_agent(agent: "Agent", key: Tuple[str, str], query: str, semantic: bool = False) -> Tuple[str, bool]:
+    """Run a query through the shared caches, coalescing and concurrency cap; returns (output, cache_hit)"""
+    # Identical queries are answered from the exact-match cache, and identical
+    # queries already in flight share that run's result
+    cached = exact_lookup(key)
+    if cached is not None:
+        return cached, True
+    return await coalesce(key, lambda: _run_uncached(agent, key, query, semantic))
+
+
 @app.post("/api/search", response_model=SearchResponse)
 async def search(request: SearchRequest):
     """Perform a web search"""
-    if not agent:
+    if not AGENTS:
         raise HTTPException(status_code=503, detail="Agent not initialized. Install openai-agents package.")
     
     try:
-        from agents import Runner
-        import concurrent.futures
-        
-        # Update context size if needed
-        if request.context_size and request.context_size != "medium":
-            from agents.tool import WebSearchTool
-            web_search = WebSearchTool(search_context_size=request.context_size)
-            agent.tools = [web_search]
-        
-        # Run the search - use asyncio to run in executor
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, 
-            lambda: Runner.run_sync(agent, request.query)
+        context_size = request.context_size or "medium"
+        output, cache_hit = await _run_agent(
+            AGENTS[context_size], (request.query, context_size), request.query, semantic=True
         )
         
         return SearchResponse(
             success=True,
             query=request.query,
-            response=result.final_output,
+            response=output,
             metadata={
                 "model": "gpt-5-mini",
                 "context_size": request.context_size,
-                "tool": "WebSearchTool"
+                "tool": "WebSearchTool",
+                "cache_hit": cache_hit
             }
         )
         
@@ -157,27 +354,67 @@ async def search(request: SearchRequest):
         )
 
 
+def sse(payload: dict) -> bytes:
+    """Encode a payload as a single Server-Sent Event"""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def stream_agent(agent: "Agent", query: str) -> AsyncIterator[str]:
+    """Run the agent in streaming mode, yielding output text deltas as they arrive"""
+    async with AGENT_SEM:
+        result = Runner.run_streamed(agent, query)
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                yield event.data.delta
+
+
+@app.post("/api/search/stream")
+async def search_stream(request: SearchRequest):
+    """Perform a web search, streaming the response as Server-Sent Events"""
+    if not AGENTS:
+        raise HTTPException(status_code=503, detail="Agent not initialized. Install openai-agents package.")
+    
+    context_size = request.context_size or "medium"
+    key = (request.query, context_size)
+    
+    async def gen():
+        cached = exact_lookup(key)
+        if cached is not None:
+            yield sse({"token": cached, "cache_hit": True})
+        else:
+            chunks = []
+            try:
+                async for delta in stream_agent(AGENTS[context_size], request.query):
+                    chunks.append(delta)
+                    yield sse({"token": delta})
+            except Exception as e:
+                # Headers are already sent, so report failures in-band
+                yield sse({"error": str(e)})
+            else:
+                exact_store(key, "".join(chunks))
+        yield sse({"done": True})
+    
+    return StreamingResponse(
+        gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/api/chat")
-async def chat(message: str):
+async def chat(request: ChatRequest):
     """Simple chat endpoint"""
-    if not agent:
+    if not AGENTS:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
+    message = request.message
     try:
-        from agents import Runner
-        import concurrent.futures
-        
-        # Run in executor
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: Runner.run_sync(agent, message)
-        )
+        output, _ = await _run_agent(AGENTS["medium"], (message, "chat"), message)
         
         return {
             "success": True,
             "message": message,
-            "response": result.final_output
+            "response": output
         }
         
     except Exception as e:
@@ -191,7 +428,7 @@ async def chat(message: str):
 @app.post("/api/search/multi-query")
 async def multi_query_search(queries: list):
     """Multi-query search endpoint"""
-    if not agent:
+    if not AGENTS:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
     return {
@@ -203,7 +440,7 @@ async def multi_query_search(queries: list):
 @app.post("/api/research")
 async def research(topic: str, depth: str = "basic"):
     """Research endpoint"""
-    if not agent:
+    if not AGENTS:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
     return {
@@ -214,4 +451,11 @@ async def research(topic: str, depth: str = "basic"):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Each worker keeps its own caches and in-flight runs, so more workers share
+    # fewer hits. Multiple workers need the app as an import string.
+    uvicorn.run(
+        "websearch_app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WORKERS", "1"))
+    )